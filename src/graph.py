@@ -1,7 +1,9 @@
 import networkx as nx
-import matplotlib.pyplot as plt
 import numpy as np
 import pickle
+import os
+
+LABELS_MAX_NODES = 200 # Above this size node labels are skipped, they dominate rendering time
 
 class Graph:
     def __init__(self, nodes: dict):
@@ -152,19 +154,74 @@ class Graph:
             pickle.dump(data, file)
         print(f"Graph saved to {filepath}")
 
-    def draw(self, file_path, title):
+    def draw(self, file_path, title, tour=None, with_labels=None):
         """
         Draws the graph and saves it to a file.
-        
+
+        All nodes are drawn with a single scatter call and the tour, if given, with a
+        single LineCollection, so the rendering cost grows slowly with the number of nodes.
+
         Args:
             file_path (str): The path where the image file will be saved.
             title (str): The title of the graph.
+            tour (list): Optional sequence of node labels to be drawn as a route over the nodes.
+            with_labels (bool): Whether to draw the node labels; if None, labels are drawn
+                                only for graphs with at most LABELS_MAX_NODES nodes.
         """
-        plt.figure(figsize=(14, 10))
-        plt.title(title, fontsize=12, fontweight='bold')
+        # Imported here so that solver processes never pay for loading matplotlib
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import LineCollection
+
+        coordinates = np.array(self.get_coordinates())
+        if with_labels is None:
+            with_labels = len(coordinates) <= LABELS_MAX_NODES
+
+        fig, ax = plt.subplots(figsize=(14, 10))
+        ax.set_title(title, fontsize=12, fontweight='bold')
+        ax.set_axis_off()
+
+        if tour:
+            route = np.array([self.pos[node] for node in tour])
+            segments = np.stack([route[:-1], route[1:]], axis=1)
+            ax.add_collection(LineCollection(segments, colors='gray', linewidths=1, zorder=1))
+
+        node_size = 300 if with_labels else 20
+        ax.scatter(coordinates[:, 0], coordinates[:, 1], c='lightblue', s=node_size, zorder=2)
+
+        if with_labels:
+            for node, (x, y) in self.pos.items():
+                ax.text(x, y, node, ha='center', va='center', fontsize=8, fontweight='bold', zorder=3)
 
-        nx.draw_networkx_nodes(self.K, self.pos, node_color='lightblue', node_size=300)
-        nx.draw_networkx_labels(self.K, self.pos, font_weight='bold', font_size=8)
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fig.savefig(file_path)
+        plt.close(fig)
 
-        plt.savefig(file_path)
-        plt.close() 
\ No newline at end of file
+def _draw_from_positions(pos, file_path, title, tour, with_labels):
+    """
+    Worker entry point for the batch rendering. Only the node positions are sent to the
+    worker, the (possibly huge) weighted networkx graph is never pickled.
+    """
+    graph = Graph({})
+    graph.pos = pos
+    graph.draw(file_path, title, tour, with_labels)
+    return file_path
+
+def draw_in_background(executor, graph, file_path, title, tour=None, with_labels=None):
+    """
+    Submits the rendering of a graph (and optionally a tour) to an executor, so that
+    the caller can keep working while the image is produced.
+
+    Args:
+        executor (concurrent.futures.Executor): The executor that will render the image.
+        graph (Graph): The graph to be drawn.
+        file_path (str): The path where the image file will be saved.
+        title (str): The title of the graph.
+        tour (list): Optional sequence of node labels to be drawn as a route.
+        with_labels (bool): See Graph.draw.
+
+    Returns:
+        concurrent.futures.Future: A future resolving to file_path once the image is saved.
+    """
+    return executor.submit(_draw_from_positions, graph.pos, file_path, title, tour, with_labels)
@@ -1,11 +1,26 @@
 from multiprocessing import Process, Queue
-from branch_and_bound import *
-from christofides import *
-from twice_around_tree import *
+from queue import Empty
 from graph import Graph
+from results_store import ResultsStore
+import argparse
+import contextlib
+import importlib
+import json
 import os
 import sys
 
+# Solver name -> (module, function, algorithm name used in the results)
+# The modules are only imported when the solver is selected, see load_solver.
+SOLVERS = {
+    'branch_and_bound': ('branch_and_bound', 'branch_and_bound', 'Branch-and-Bound'),
+    'twice_around_tree': ('twice_around_tree', 'twice_around_tree', 'Twice-Around-the-Tree'),
+    'christofides': ('christofides', 'chistofides', 'Christofides'),
+}
+
+def load_solver(name):
+    module_name, function_name, _ = SOLVERS[name]
+    return getattr(importlib.import_module(module_name), function_name)
+
 def parse_file(file_path: str) -> dict:
     nodes = dict()
     with open(file_path, 'r') as file:
@@ -42,83 +57,188 @@ def create_graph(file_path):
     return graph
 
 def save_graphs_into_disk():
+    from concurrent.futures import ProcessPoolExecutor
+    from graph import draw_in_background
+
     base_dir = "test_data"
     test_files = os.listdir(base_dir)
     progress = 0
-    for test_file in test_files:
-        progress += 1
-        print(f"Processing file: {test_file}")
-        graph = create_graph(f'{base_dir}/{test_file}')
-        if len(graph.get_nodes()) > 2000:
-            print("Skipping file due to high number of nodes...")
-            continue
-        graph.calculate_distances()
-        
-        title = test_file.replace(".", "_")
-        graph.draw(f"plots/graphs/{title}.png", title)
-        graph.save(f"graphs/{title}.pkl")
-
-        print(f'({100*progress/len(test_files): .2f}% done...)\n')
-
-if __name__ == '__main__':
-    sys.setrecursionlimit(1500)
-    base_dir = "graphs"
-    graph_pickles = os.listdir(base_dir)
-
-    # save_graphs_into_disk() # Just needed once
+    renders = []
+    with ProcessPoolExecutor() as executor: # Plots are rendered off the preprocessing loop
+        for test_file in test_files:
+            progress += 1
+            print(f"Processing file: {test_file}")
+            graph = create_graph(f'{base_dir}/{test_file}')
+            if len(graph.get_nodes()) > 2000:
+                print("Skipping file due to high number of nodes...")
+                continue
 
+            title = test_file.replace(".", "_")
+            renders.append(draw_in_background(executor, graph, f"plots/graphs/{title}.png", title))
+
+            graph.calculate_distances()
+            graph.save(f"graphs/{title}.pkl")
+
+            print(f'({100*progress/len(test_files): .2f}% done...)\n')
+
+        for render in renders:
+            print(f"Plot saved to {render.result()}")
+
+def solve_and_measure(solver_name, graph, start_node, result_queue, measurement_queue, diagnostics_to_stderr=False):
+    """
+    Runs a solver (decorated with utils.measure) and sends its time and memory through
+    measurement_queue once it finishes. Meant to be the target of the solver process,
+    which is the only one to import the solver module; the parent stores the results.
+    The solver's progress messages go to stderr if diagnostics_to_stderr is set.
+    """
+    if diagnostics_to_stderr:
+        sys.stdout = sys.stderr
+    solver = load_solver(solver_name)
+    solver(graph, start_node, result_queue)
+    measurement_queue.put(solver.last_measurement)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Solve TSP instances with Branch-And-Bound, Twice-around-the-tree or Christofides.")
+    parser.add_argument('solver', choices=SOLVERS.keys(), help="the algorithm used to solve the instances")
+    parser.add_argument('-i', '--instances', nargs='+', metavar='NAME',
+                        help="instances to solve, e.g. berlin52 (default: every graph in --graphs-dir)")
+    parser.add_argument('-t', '--timeout', type=float, default=1800, help="timeout per instance in seconds (default: 1800)")
+    parser.add_argument('-s', '--start-node', default='1', help="label of the node to start from (default: 1)")
+    parser.add_argument('-f', '--format', choices=['text', 'json'], default='text',
+                        help="output format of the results, json prints one object per line on stdout "
+                             "and every other message on stderr (default: text)")
+    parser.add_argument('--graphs-dir', default='graphs', help="directory with the pickled graphs (default: graphs)")
+    parser.add_argument('--store', default='results/results.db', help="results store path (default: results/results.db)")
+    parser.add_argument('--no-store', action='store_true', help="do not append the results to the results store")
+    parser.add_argument('--plot-tours', action='store_true', help="render the solved tours under plots/tours")
+    parser.add_argument('--preprocess', action='store_true',
+                        help="parse test_data into graphs and plots/graphs before solving (just needed once)")
+    return parser
+
+def print_result(output_format, records, instance, algorithm, route, cost, timed_out):
+    """
+    Prints the result of an instance; cost is None if the solver returned no result.
+    JSON records are written to the records stream, text goes to stdout as before.
+    """
+    if output_format == 'json':
+        print(json.dumps({
+            'instance': instance,
+            'algorithm': algorithm,
+            'route': route,
+            'cost': cost,
+            'timed_out': timed_out
+        }), file=records, flush=True)
+    elif cost is None:
+        if not timed_out:
+            print("No result was returned.")
+    elif timed_out:
+        print(f"INFO: Minimized Cost: {cost}")
+    else:
+        print(f"INFO: Best Route: {route}, Best Cost: {cost}")
+
+def solve_instances(parser, args, records):
+    """
+    Solves the instances selected by the command-line arguments, printing the JSON
+    records (if --format json) to the records stream.
+    """
+    diagnostics_to_stderr = args.format == 'json'
+
+    if args.preprocess:
+        save_graphs_into_disk()
+
+    if args.instances:
+        graph_pickles = [f"{name.replace('_tsp', '')}_tsp.pkl" for name in args.instances]
+        missing = [name for name, pickle in zip(args.instances, graph_pickles)
+                   if not os.path.isfile(os.path.join(args.graphs_dir, pickle))]
+        if missing:
+            parser.error(f"instances not found in {args.graphs_dir}: {', '.join(missing)}")
+    else:
+        graph_pickles = sorted(name for name in os.listdir(args.graphs_dir) if name.endswith('.pkl'))
+
+    store_path = None if args.no_store else args.store
+    if store_path is not None:
+        with ResultsStore(store_path) as store:
+            store.load_optimal_solutions()
+    algorithm = SOLVERS[args.solver][2]
+    executor = None # Tours are rendered off the solving loop, as soon as each one is solved
+    renders = []
+    if args.plot_tours:
+        from concurrent.futures import ProcessPoolExecutor
+        from graph import draw_in_background
+        executor = ProcessPoolExecutor()
     for pickle in graph_pickles:
-        # if pickle != "d1291_tsp.pkl":
-        #     continue
-        # nodes = {
-        #     "1": (16.47, 96.10),
-        #     "2": (16.47, 94.44),
-        #     "3": (20.09, 92.54),
-        #     "4": (22.39, 93.37),
-        #     "5": (25.23, 97.24),
-        #     "6": (22.00, 96.05),
-        #     "7": (20.47, 97.02),
-        #     "8": (17.20, 96.29),
-        #     "9": (16.30, 97.38),
-        #     "10": (14.05, 98.12),
-        #     "11": (16.53, 97.38),
-        #     "12": (21.52, 95.59),
-        #     "13": (19.41, 97.13),
-        #     "14": (20.09, 94.55),
-        # }
-
-        # nodes = {
-        #     "1": (16.47, 96.10),
-        #     "2": (16.47, 94.44),
-        #     "3": (20.09, 92.54),
-        #     "4": (22.39, 93.37),
-        #     "5": (25.23, 97.24),
-        #     "6": (22.00, 96.05),
-        # }
-
-        # graph = Graph(nodes)
-        graph = Graph.load(f'{base_dir}/{pickle}')
-        
+        graph = Graph.load(f'{args.graphs_dir}/{pickle}')
+        if args.start_node not in graph.get_nodes():
+            print(f"Start node {args.start_node} is not a node of {pickle}, skipping instance...")
+            continue
 
         result_queue = Queue()
+        measurement_queue = Queue()
 
-        process = Process(target=chistofides, args=(graph, 1, result_queue))
+        instance = pickle.replace("_tsp.pkl", "")
+        process = Process(target=solve_and_measure, args=(args.solver, graph, args.start_node, result_queue, measurement_queue, diagnostics_to_stderr))
         process.start()
 
-        process.join(timeout=1800) # 30 minutes
+        process.join(timeout=args.timeout)
 
-        if process.is_alive():
+        # A solver that already sent its measurement finished in time, even if its process
+        # is still alive flushing the queued results
+        timed_out = process.is_alive() and measurement_queue.empty()
+        if timed_out:
             print("Function timed out. Terminating process...")
-            if not result_queue.empty():
-                _, minimized_cost = result_queue.get()
-                print(f"INFO: Minimized Cost: {minimized_cost}")
+
+        # The last result is the final (labelled) route, or the most minimized one on timeouts.
+        # A finished solver is drained until its process exits, so it is never blocked flushing.
+        route, cost = None, None
+        while True:
+            try:
+                route, cost = result_queue.get(timeout=0.1)
+            except Empty:
+                if timed_out or not process.is_alive():
+                    break
+
+        if timed_out:
             process.terminate()
-            process.join()
+        process.join()
+        measurement = None if timed_out or measurement_queue.empty() else measurement_queue.get()
+
+        # Only this process writes to the store, so each solve is stored exactly once
+        if cost is not None and store_path is not None:
+            with ResultsStore(store_path) as store:
+                store.add_instance(instance, len(graph.get_nodes()))
+                if timed_out:
+                    # The run took (at least) the whole timeout, so it still counts in the time averages
+                    store.append(instance, algorithm, cost, time_taken=args.timeout, timed_out=True)
+                else:
+                    measurement = measurement or {}
+                    store.append(instance, algorithm, cost, measurement.get('time_taken'), measurement.get('memory_taken'))
+
+        if timed_out:
+            print_result(args.format, records, instance, algorithm, None, cost, True)
+        elif cost is not None:
+            print_result(args.format, records, instance, algorithm, route, cost, False)
+            if args.plot_tours:
+                title = pickle.replace(".pkl", "")
+                renders.append(draw_in_background(executor, graph, f"plots/tours/{title}.png", title, route))
         else:
-            # Retrieve the result from the queue if the function finished in time
-            if not result_queue.empty():
-                best_route, best_cost = result_queue.get()
-                print(f"INFO: Best Route: {best_route}, Best Cost: {best_cost}")
-            else:
-                print("No result was returned.")
-    
\ No newline at end of file
+            print_result(args.format, records, instance, algorithm, None, None, False)
+
+    if executor is not None:
+        for render in renders:
+            print(f"Plot saved to {render.result()}")
+        executor.shutdown()
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    sys.setrecursionlimit(1500)
+
+    records = sys.stdout
+    if args.format == 'json': # Keep stdout for the JSON records only
+        with contextlib.redirect_stdout(sys.stderr):
+            solve_instances(parser, args, records)
+    else:
+        solve_instances(parser, args, records)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+import csv
+import sqlite3
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Optimal tour costs of the TSPLIB instances, taken from the optimal_solution column
+# of our experiments table (it covers every instance with at most 2000 nodes)
+OPTIMAL_SOLUTIONS_CSV = "results/final_results.csv"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS instances (
+    instance TEXT PRIMARY KEY,
+    number_nodes INTEGER,
+    optimal_solution REAL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    instance TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    run INTEGER NOT NULL,
+    best_solution REAL,
+    time_taken REAL,
+    memory_taken INTEGER,
+    timed_out INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (instance, algorithm, run)
+);
+CREATE INDEX IF NOT EXISTS runs_by_algorithm ON runs (algorithm, instance);
+"""
+
+# Same columns (and names) as results/final_results.csv, one row per (instance, algorithm)
+SUMMARY_QUERY = """
+SELECT
+    r.instance AS tsp_problem,
+    r.algorithm AS algorithm,
+    AVG(r.time_taken) AS time_taken,
+    AVG(r.memory_taken) AS memory_taken,
+    MIN(r.best_solution) AS best_solution,
+    i.optimal_solution AS optimal_solution,
+    ROUND(100.0 * (MIN(r.best_solution) - i.optimal_solution) / i.optimal_solution, 2) AS worse_percentage,
+    i.number_nodes AS number_nodes,
+    COUNT(*) AS runs
+FROM runs r
+LEFT JOIN instances i ON i.instance = r.instance
+{where}
+GROUP BY r.instance, r.algorithm
+ORDER BY r.algorithm, i.number_nodes
+"""
+
+METRICS_VS_NODES_QUERY = """
+SELECT
+    r.algorithm AS algorithm,
+    i.number_nodes AS number_nodes,
+    AVG(100.0 * (r.best_solution - i.optimal_solution) / i.optimal_solution) AS worse_percentage,
+    AVG(r.time_taken) AS time_taken,
+    AVG(r.memory_taken) AS memory_taken,
+    COUNT(*) AS runs
+FROM runs r
+JOIN instances i ON i.instance = r.instance
+{where}
+GROUP BY r.algorithm, i.number_nodes
+ORDER BY r.algorithm, i.number_nodes
+"""
+
+class ResultsStore:
+    def __init__(self, filepath: str):
+        """
+        Opens (or creates) a SQLite results store.
+
+        Every solver run is a row of the `runs` table, indexed by (instance, algorithm, run),
+        and the instance metadata (number of nodes and optimal solution) is kept once in the
+        `instances` table. Aggregations are done by SQLite, so reports stay fast with tens of
+        thousands of runs.
+
+        Args:
+            filepath (str): The path of the SQLite database file.
+        """
+        self.filepath = filepath
+        self.connection = sqlite3.connect(filepath)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_instance(self, instance, number_nodes=None, optimal_solution=None):
+        """
+        Registers a TSP instance, values already known are kept when given as None.
+
+        Args:
+            instance (str): The name of the TSP instance, e.g. 'berlin52'.
+            number_nodes (int): The number of nodes of the instance.
+            optimal_solution (float): The cost of the optimal tour.
+        """
+        with self.connection:
+            self.connection.execute(
+                """
+                INSERT INTO instances (instance, number_nodes, optimal_solution) VALUES (?, ?, ?)
+                ON CONFLICT (instance) DO UPDATE SET
+                    number_nodes = COALESCE(excluded.number_nodes, number_nodes),
+                    optimal_solution = COALESCE(excluded.optimal_solution, optimal_solution)
+                """,
+                (instance, number_nodes, optimal_solution)
+            )
+
+    def next_run(self, instance, algorithm) -> int:
+        row = self.connection.execute(
+            "SELECT COALESCE(MAX(run), 0) + 1 FROM runs WHERE instance = ? AND algorithm = ?",
+            (instance, algorithm)
+        ).fetchone()
+        return row[0]
+
+    def append(self, instance, algorithm, best_solution, time_taken=None, memory_taken=None,
+               timed_out=False, run=None) -> int:
+        """
+        Appends the result of a single solver run.
+
+        Args:
+            instance (str): The name of the TSP instance.
+            algorithm (str): The name of the algorithm, e.g. 'Christofides'.
+            best_solution (float): The cost of the best tour found.
+            time_taken (float): The execution time in seconds (the timeout for timed out runs),
+                                None if unknown.
+            memory_taken (int): The memory consumed in bytes, None if unknown.
+            timed_out (bool): Whether the run was stopped by the timeout.
+            run (int): The run number; if None, the next free number is used.
+
+        Returns:
+            int: The run number of the stored row.
+        """
+        with self.connection:
+            if run is None:
+                run = self.next_run(instance, algorithm)
+            self.connection.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (instance, algorithm, run, best_solution, time_taken, memory_taken, int(timed_out))
+            )
+        return run
+
+    def load_optimal_solutions(self, csv_file=OPTIMAL_SOLUTIONS_CSV):
+        """
+        Fills the optimal solution of the instances from a CSV with the columns tsp_problem
+        and optimal_solution, like results/final_results.csv. Without it the gap
+        (worse_percentage) of the stored runs cannot be computed.
+
+        Args:
+            csv_file (str): Path to the CSV file containing the optimal solutions.
+        """
+        with open(csv_file, newline='') as file:
+            optimal_solutions = {
+                row['tsp_problem']: float(row['optimal_solution'])
+                for row in csv.DictReader(file)
+                if row['optimal_solution'] not in ('', 'NA')
+            }
+        for instance, optimal_solution in optimal_solutions.items():
+            self.add_instance(instance, optimal_solution=optimal_solution)
+
+    def import_csv(self, csv_file):
+        """
+        Imports a results CSV in the format of results/final_results.csv, each row becoming
+        a new run of its (instance, algorithm).
+
+        Args:
+            csv_file (str): Path to the CSV file containing the data.
+        """
+        import pandas as pd
+
+        data = pd.read_csv(csv_file)
+
+        instances = data[['tsp_problem', 'number_nodes', 'optimal_solution']].drop_duplicates('tsp_problem')
+        for row in instances.astype(object).where(instances.notna(), None).itertuples(index=False):
+            self.add_instance(*row)
+
+        # Continue the run numbering of each (instance, algorithm) already in the store
+        last_run = pd.read_sql_query(
+            "SELECT instance AS tsp_problem, algorithm, MAX(run) AS last_run FROM runs GROUP BY instance, algorithm",
+            self.connection
+        )
+        data = data.merge(last_run, on=['tsp_problem', 'algorithm'], how='left')
+        data['run'] = data['last_run'].fillna(0).astype(int) + data.groupby(['tsp_problem', 'algorithm']).cumcount() + 1
+        data['timed_out'] = 0
+
+        runs = data[['tsp_problem', 'algorithm', 'run', 'best_solution', 'time_taken', 'memory_taken', 'timed_out']]
+        runs = runs.astype(object).where(runs.notna(), None)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                runs.itertuples(index=False, name=None)
+            )
+
+    def _query(self, query, algorithm):
+        import pandas as pd # Only the reports need pandas, solver processes just append
+
+        where, params = "", ()
+        if algorithm is not None:
+            where, params = "WHERE r.algorithm = ?", (algorithm,)
+        return pd.read_sql_query(query.format(where=where), self.connection, params=params)
+
+    def runs(self, algorithm=None) -> 'pd.DataFrame':
+        """Returns every stored run, optionally only of the given algorithm."""
+        return self._query("SELECT r.* FROM runs r {where}", algorithm)
+
+    def summary(self, algorithm=None) -> 'pd.DataFrame':
+        """
+        Aggregates the runs per (instance, algorithm), with the same columns as
+        results/final_results.csv plus the number of runs.
+
+        Args:
+            algorithm (str): If given, only the runs of this algorithm are aggregated.
+        """
+        return self._query(SUMMARY_QUERY, algorithm)
+
+    def metrics_vs_nodes(self, algorithm=None) -> 'pd.DataFrame':
+        """
+        Aggregates the mean gap (worse_percentage), time and memory per
+        (algorithm, number_nodes).
+
+        Args:
+            algorithm (str): If given, only the runs of this algorithm are aggregated.
+        """
+        return self._query(METRICS_VS_NODES_QUERY, algorithm)
@@ -1,24 +1,47 @@
 import matplotlib.pyplot as plt
+import numpy as np
 import os
 import pandas as pd
 
-def compare_solutions(csv_file):
-    df = pd.read_csv(csv_file)
+from results_store import ResultsStore
 
-    print("Comparison of Best Solution vs Optimal Solution:")
-    for index, row in df.iterrows():
-        tsp_problem = row['tsp_problem']
-        best_solution = row['best_solution']
-        optimal_solution = row['optimal_solution']
+def load_results(results, algorithm=None):
+    """
+    Loads the results table used by the reports and plots.
+
+    Args:
+        results (str | pandas.DataFrame | ResultsStore): A DataFrame (returned as is), a
+            ResultsStore, the path of a SQLite results store ('.db') or the path of a CSV
+            file in the format of results/final_results.csv.
+        algorithm (str): If given, only the results of this algorithm are returned.
+
+    Returns:
+        pandas.DataFrame: One row per (tsp_problem, algorithm).
+    """
+    if isinstance(results, ResultsStore):
+        return results.summary(algorithm)
+    if isinstance(results, str) and results.endswith('.db'):
+        with ResultsStore(results) as store:
+            return store.summary(algorithm)
+
+    data = results if isinstance(results, pd.DataFrame) else pd.read_csv(results)
+    if algorithm is not None:
+        data = data[data['algorithm'] == algorithm]
+    return data
 
-        if pd.isna(best_solution) or pd.isna(optimal_solution):
-            print(f"{tsp_problem}: Unable to compare due to missing values.")
-        else:
-            # Calculate the difference and percentage worse
-            difference = best_solution - optimal_solution
-            percentage_worse = (difference / optimal_solution) * 100
+def compare_solutions(results, algorithm=None):
+    df = load_results(results, algorithm)
 
-            print(f"{tsp_problem}: Best solution is {percentage_worse:.2f}% worse than the optimal solution.")
+    print("Comparison of Best Solution vs Optimal Solution:")
+    # Calculate the percentage worse for every row at once
+    percentage_worse = (df['best_solution'] - df['optimal_solution']) / df['optimal_solution'] * 100
+
+    lines = [
+        f"{tsp_problem} ({algorithm}): Unable to compare due to missing values." if pd.isna(percentage)
+        else f"{tsp_problem} ({algorithm}): Best solution is {percentage:.2f}% worse than the optimal solution."
+        for tsp_problem, algorithm, percentage in zip(df['tsp_problem'], df['algorithm'], percentage_worse)
+    ]
+    print("\n".join(lines))
 
 def print_nb_nodes(directory="test_data"):
     try:
@@ -41,41 +64,54 @@ def print_nb_nodes(directory="test_data"):
         print(f"Error accessing directory '{directory}': {e}")
 
 
-def plot_worse_percentage(csv_file, fig_path):
+def plot_worse_percentage(results, fig_path, algorithm=None):
     """
-    Plots a bar chart showing the values of worse_percentage for each tsp_problem.
+    Plots a bar chart showing the values of worse_percentage for each tsp_problem, with
+    one bar per algorithm side by side when the results hold more than one.
 
     Args:
-        csv_file (str): Path to the CSV file containing the data.
+        results (str | pandas.DataFrame | ResultsStore): The results, see load_results.
+        algorithm (str): If given, only the results of this algorithm are used.
     """
-    data = pd.read_csv(csv_file)
+    data = load_results(results, algorithm)
 
     data = data.dropna(subset=['worse_percentage'])
 
     data['worse_percentage'] = pd.to_numeric(data['worse_percentage'])
 
+    # One row per tsp_problem and one column per algorithm
+    percentages = data.pivot_table(index='tsp_problem', columns='algorithm', values='worse_percentage', sort=False)
+    positions = np.arange(len(percentages))
+    width = 0.8 / len(percentages.columns)
+
     plt.figure(figsize=(12, 6))
-    plt.bar(data['tsp_problem'], data['worse_percentage'], color='skyblue')
+    for k, algorithm_name in enumerate(percentages.columns):
+        offset = (k - (len(percentages.columns) - 1) / 2) * width
+        color = 'skyblue' if len(percentages.columns) == 1 else None
+        plt.bar(positions + offset, percentages[algorithm_name], width, color=color, label=algorithm_name)
+    if len(percentages.columns) > 1:
+        plt.legend()
 
     # Adding labels and title
     plt.xlabel('TSP Problem', fontsize=12)
     plt.ylabel('Worse Percentage', fontsize=12)
     plt.title('Worse Percentage for Each TSP Problem', fontsize=14)
-    plt.xticks(rotation=45, ha='right', fontsize=10)
+    plt.xticks(positions, percentages.index, rotation=45, ha='right', fontsize=10)
     plt.tight_layout()
     
     plt.savefig(fig_path)
     plt.close()
 
-def plot_worse_percentage_vs_nodes(csv_file, fig_path):
+def plot_worse_percentage_vs_nodes(results, fig_path, algorithm=None):
     """
-    Creates a line plot of worse_percentage (y-axis) as a function of number_nodes (x-axis).
-    The number of nodes will be sorted in ascending order.
+    Creates a line plot of worse_percentage (y-axis) as a function of number_nodes (x-axis),
+    with one line per algorithm. The number of nodes will be sorted in ascending order.
 
     Args:
-        csv_file (str): Path to the CSV file containing the data.
+        results (str | pandas.DataFrame | ResultsStore): The results, see load_results.
+        algorithm (str): If given, only the results of this algorithm are used.
     """
-    data = pd.read_csv(csv_file)
+    data = load_results(results, algorithm)
 
     data = data.dropna(subset=['worse_percentage', 'number_nodes'])
 
@@ -84,12 +120,52 @@ def plot_worse_percentage_vs_nodes(csv_file, fig_path):
 
     data = data.sort_values(by='number_nodes')
 
+    groups = data.groupby('algorithm')
+
     plt.figure(figsize=(10, 6))
-    plt.plot(data['number_nodes'], data['worse_percentage'], marker='o', linestyle='-', color='blue')
+    for algorithm_name, group in groups:
+        color = 'blue' if groups.ngroups == 1 else None
+        plt.plot(group['number_nodes'], group['worse_percentage'], marker='o', linestyle='-', color=color, label=algorithm_name)
 
     plt.xlabel('Number of Nodes', fontsize=12)
     plt.ylabel('Worse Percentage', fontsize=12)
     plt.title('Worse Percentage vs Number of Nodes', fontsize=14)
+    if groups.ngroups > 1:
+        plt.legend()
+
+    plt.grid(True, linestyle='--', alpha=0.6)
+
+    plt.tight_layout()
+    plt.savefig(fig_path)
+    plt.close()
+
+def plot_metric_vs_nodes(store, metric, fig_path):
+    """
+    Creates a line plot of a metric (y-axis) as a function of number_nodes (x-axis), with
+    one line per algorithm. The aggregation is done by the results store.
+
+    Args:
+        store (ResultsStore | str): The results store or the path of its database.
+        metric (str): One of 'worse_percentage', 'time_taken' or 'memory_taken'.
+        fig_path (str): The path where the image file will be saved.
+    """
+    if isinstance(store, str):
+        with ResultsStore(store) as opened_store:
+            data = opened_store.metrics_vs_nodes()
+    else:
+        data = store.metrics_vs_nodes()
+
+    data = data.dropna(subset=[metric])
+    label = metric.replace('_', ' ').title()
+
+    plt.figure(figsize=(10, 6))
+    for algorithm, group in data.groupby('algorithm'):
+        plt.plot(group['number_nodes'], group[metric], marker='o', linestyle='-', label=algorithm)
+
+    plt.xlabel('Number of Nodes', fontsize=12)
+    plt.ylabel(label, fontsize=12)
+    plt.title(f'{label} vs Number of Nodes', fontsize=14)
+    plt.legend()
 
     plt.grid(True, linestyle='--', alpha=0.6)
 
@@ -97,14 +173,15 @@ def plot_worse_percentage_vs_nodes(csv_file, fig_path):
     plt.savefig(fig_path)
     plt.close()
 
-def display_top_five_worse_percentages(csv_file):
+def display_top_five_worse_percentages(results, algorithm=None):
     """
     Displays the top five worse percentages and their respective TSP problems.
 
     Args:
-        csv_file (str): Path to the CSV file containing the data.
+        results (str | pandas.DataFrame | ResultsStore): The results, see load_results.
+        algorithm (str): If given, only the results of this algorithm are used.
     """
-    data = pd.read_csv(csv_file)
+    data = load_results(results, algorithm)
 
     data = data.dropna(subset=['worse_percentage'])
 
@@ -113,16 +190,17 @@ def display_top_five_worse_percentages(csv_file):
     top_five = data.nlargest(5, 'worse_percentage')
 
     print("Top Five Worse Percentages:")
-    print(top_five[['tsp_problem', 'worse_percentage']])
+    print(top_five[['tsp_problem', 'algorithm', 'worse_percentage']])
 
-def display_top_five_smallest_percentages(csv_file):
+def display_top_five_smallest_percentages(results, algorithm=None):
     """
     Displays the top five smallest worse percentages and their respective TSP problems.
 
     Args:
-        csv_file (str): Path to the CSV file containing the data.
+        results (str | pandas.DataFrame | ResultsStore): The results, see load_results.
+        algorithm (str): If given, only the results of this algorithm are used.
     """
-    data = pd.read_csv(csv_file)
+    data = load_results(results, algorithm)
 
     data = data.dropna(subset=['worse_percentage'])
 
@@ -131,6 +209,7 @@ def display_top_five_smallest_percentages(csv_file):
     smallest_five = data.nsmallest(5, 'worse_percentage')
 
     print("Top Five Smallest Worse Percentages:")
-    print(smallest_five[['tsp_problem', 'worse_percentage']])
+    print(smallest_five[['tsp_problem', 'algorithm', 'worse_percentage']])
 
-display_top_five_smallest_percentages("results/processed/branch_and_bound.csv")
+if __name__ == '__main__':
+    display_top_five_smallest_percentages("results/processed/branch_and_bound.csv")
@@ -12,7 +12,9 @@ def measure(func):
 
     Returns:
         callable: A wrapper function that, when called, executes the original function
-                  and prints memory usage and execution time information.
+                  and prints memory usage and execution time information. The last
+                  measurement is also kept in the wrapper's `last_measurement` attribute
+                  as a dict with the keys 'time_taken' and 'memory_taken'.
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
@@ -26,5 +28,10 @@ def measure(func):
         print(f"INFO: Memory after: {mem_after} bytes")
         print(f"INFO: Memory consumed: {mem_after - mem_before} bytes")
         print(f"INFO: Time elapsed: {end - start} seconds")
+        wrapper.last_measurement = {
+            'time_taken': end - start,
+            'memory_taken': mem_after - mem_before
+        }
         return result
+    wrapper.last_measurement = None
     return wrapper
\ No newline at end of file